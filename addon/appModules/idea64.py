@@ -5,7 +5,10 @@
 #https://github.com/SamKacer/IntelliJ_NVDA_Addon
 
 from buildVersion import version_year
+from collections import deque
 from dataclasses import dataclass
+from typing import NamedTuple, Optional
+import sys
 from unicodedata import category
 import appModuleHandler
 import tones
@@ -14,6 +17,7 @@ import config
 from editableText import EditableTextWithoutAutoSelectDetection
 from logHandler import log
 import gui
+import inputCore
 from gui.settingsDialogs import SettingsPanel
 from scriptHandler import script
 import speech
@@ -43,6 +47,7 @@ BEEP_BEFORE_READING_KEY = 'beepBeforeReadingStatus'
 BEEP_AFTER_READING_KEY = 'beepAfterReadingStatus'
 BEEP_ON_BREAKPOINT_KEY = 'beepOnBreakpoint'
 AUTOSELECT_TREEVIEW_IN_FIND_USAGES_KEY = 'autoselectTreeviewInFindUsages'
+STATUS_HISTORY_SIZE_KEY = 'statusHistorySize'
 
 DEFAULT_BEEP_ON_CHANGE = False
 DEFAULT_BEEP_ON_STATUS_CLEARED = False
@@ -52,6 +57,14 @@ DEFAULT_BEEP_BEFORE_READING = True
 DEFAULT_BEEP_AFTER_READING = False
 DEFAULT_BEEP_ON_BREAKPOINT = False
 DEFAULT_AUTOSELECT_TREEVIEW_IN_FIND_USAGES = True
+DEFAULT_STATUS_HISTORY_SIZE = 50
+MIN_STATUS_HISTORY_SIZE = 1
+MAX_STATUS_HISTORY_SIZE = 1000
+
+# milliseconds to wait after the caret moves for IntelliJ to update the line number in the status bar
+STATUS_BAR_UPDATE_DELAY = 100
+# milliseconds to wait for the caret to move after a navigation gesture before giving up on announcing the jump
+NAVIGATION_TIMEOUT = 2000
 
 config.conf.spec[CONF_KEY] = {
 	BEEP_ON_STATUS_CHANGED_KEY : f'boolean(default={DEFAULT_BEEP_ON_CHANGE})',
@@ -62,6 +75,7 @@ config.conf.spec[CONF_KEY] = {
 	BEEP_AFTER_READING_KEY : f'boolean(default={DEFAULT_BEEP_AFTER_READING})',
 	BEEP_ON_BREAKPOINT_KEY: f'boolean(default={DEFAULT_BEEP_ON_BREAKPOINT})',
 	AUTOSELECT_TREEVIEW_IN_FIND_USAGES_KEY: f'boolean(default={DEFAULT_AUTOSELECT_TREEVIEW_IN_FIND_USAGES})',
+	STATUS_HISTORY_SIZE_KEY: f'integer(default={DEFAULT_STATUS_HISTORY_SIZE}, min={MIN_STATUS_HISTORY_SIZE}, max={MAX_STATUS_HISTORY_SIZE})',
 }
 
 class IntelliJAddonSettings(SettingsPanel):
@@ -86,6 +100,12 @@ class IntelliJAddonSettings(SettingsPanel):
 		self.autoselectInFindUsages.SetValue(conf[AUTOSELECT_TREEVIEW_IN_FIND_USAGES_KEY])
 		self.beepOnBreakpoint = sHelper.addItem(wx.CheckBox(self, label="(Experimental) Beep when breakpoint is detected on current line"))
 		self.beepOnBreakpoint.SetValue(conf[BEEP_ON_BREAKPOINT_KEY])
+		self.statusHistorySize = sHelper.addLabeledControl(
+			"Number of status bar messages to keep in history",
+			gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=MIN_STATUS_HISTORY_SIZE,
+			max=MAX_STATUS_HISTORY_SIZE,
+			initial=conf[STATUS_HISTORY_SIZE_KEY])
 
 	def onSave(self):
 		conf = config.conf[CONF_KEY]
@@ -97,10 +117,15 @@ class IntelliJAddonSettings(SettingsPanel):
 		conf[BEEP_AFTER_READING_KEY] = self.beepAfterReading.Value
 		conf[BEEP_ON_BREAKPOINT_KEY] = self.beepOnBreakpoint.Value
 		conf[AUTOSELECT_TREEVIEW_IN_FIND_USAGES_KEY] = self.autoselectInFindUsages.Value
+		conf[STATUS_HISTORY_SIZE_KEY] = self.statusHistorySize.Value
 		setGlobalVars()
 
-@dataclass
-class Vars:
+class Vars(NamedTuple):
+	"""Immutable snapshot of the add-on settings.
+	Hot paths read settings from here with a single attribute access instead of going through config.conf.
+	The snapshot is swapped out as a whole by setGlobalVars whenever the settings can have changed,
+	so a reader holding a reference always sees a consistent set of values.
+	"""
 	beepOnChange: bool = DEFAULT_BEEP_ON_CHANGE
 	beepOnClear: bool = DEFAULT_BEEP_ON_STATUS_CLEARED
 	speakOnChange: bool = DEFAULT_SPEAK_ON_CHANGE
@@ -109,25 +134,83 @@ class Vars:
 	beepAfterReading: bool = DEFAULT_BEEP_AFTER_READING
 	beepOnBreakpoint: bool = DEFAULT_BEEP_ON_BREAKPOINT
 	autoselectTreeviewInFindUsages: bool = DEFAULT_AUTOSELECT_TREEVIEW_IN_FIND_USAGES
+	statusHistorySize: int = DEFAULT_STATUS_HISTORY_SIZE
 
 vars = Vars()
 
 def setGlobalVars():
+	global vars
 	conf = config.conf[CONF_KEY]
-	vars.beepOnChange = conf[BEEP_ON_STATUS_CHANGED_KEY]
-	vars.beepOnClear = conf[BEEP_ON_STATUS_CLEARED_KEY]
-	vars.speakOnChange = conf[SPEAK_ON_STATUS_CHANGED_KEY]
-	vars.interruptSpeech = conf[INTERRUPT_SPEECH_KEY]
-	vars.beepBeforeReading = conf[BEEP_BEFORE_READING_KEY]
-	vars.beepAfterReading = conf[BEEP_AFTER_READING_KEY]
-	vars.beepOnBreakpoint = conf[BEEP_ON_BREAKPOINT_KEY]
-	vars.autoselectTreeviewInFindUsages = conf[AUTOSELECT_TREEVIEW_IN_FIND_USAGES_KEY]
+	vars = Vars(
+		beepOnChange=conf[BEEP_ON_STATUS_CHANGED_KEY],
+		beepOnClear=conf[BEEP_ON_STATUS_CLEARED_KEY],
+		speakOnChange=conf[SPEAK_ON_STATUS_CHANGED_KEY],
+		interruptSpeech=conf[INTERRUPT_SPEECH_KEY],
+		beepBeforeReading=conf[BEEP_BEFORE_READING_KEY],
+		beepAfterReading=conf[BEEP_AFTER_READING_KEY],
+		beepOnBreakpoint=conf[BEEP_ON_BREAKPOINT_KEY],
+		autoselectTreeviewInFindUsages=conf[AUTOSELECT_TREEVIEW_IN_FIND_USAGES_KEY],
+		statusHistorySize=conf[STATUS_HISTORY_SIZE_KEY],
+	)
 
 # initialize conf in case being run for the first time
 if config.conf.get(CONF_KEY) is None:
 	config.conf[CONF_KEY] = {}
 setGlobalVars()
 
+# number of running app modules using the config handlers below,
+# so one IntelliJ process exiting doesn't stop updates for the others
+_configHandlerUsers = 0
+
+def registerConfigHandlers():
+	global _configHandlerUsers
+	if _configHandlerUsers == 0:
+		config.post_configProfileSwitch.register(setGlobalVars)
+		config.post_configReset.register(setGlobalVars)
+		# a profile may have been switched since the last app module terminated
+		setGlobalVars()
+	_configHandlerUsers += 1
+
+def unregisterConfigHandlers():
+	global _configHandlerUsers
+	_configHandlerUsers -= 1
+	if _configHandlerUsers == 0:
+		config.post_configProfileSwitch.unregister(setGlobalVars)
+		config.post_configReset.unregister(setGlobalVars)
+
+
+NAVIGATION_GESTURES = (
+	"kb:f2",
+	"kb:shift+f2",
+	"kb:control+b",
+	"kb:control+alt+leftArrow",
+	"kb:control+alt+rightArrow",
+	"kb:f3",
+	"kb:shift+f3",
+	"kb:control+u",
+	"kb:control+shift+backspace",
+	"kb:alt+j",
+	"kb:alt+control+downArrow",
+	"kb:alt+control+upArrow",
+	"kb:f8",
+	"kb:alt+shift+f8",
+	"kb:f7",
+	"kb:alt+shift+f7",
+	"kb:shift+f7",
+	"kb:shift+f8",
+	"kb:alt+f10",
+)
+NAVIGATION_GESTURE_IDS = frozenset(inputCore.normalizeGestureIdentifier(g) for g in NAVIGATION_GESTURES)
+
+def isNavigationGesture(gesture) -> bool:
+	return any(identifier in NAVIGATION_GESTURE_IDS for identifier in gesture.normalizedIdentifiers)
+
+
+class CaretPosition(NamedTuple):
+	file: str
+	line: int
+	column: Optional[int]
+
 
 class EnhancedEditableText(EditableTextWithoutAutoSelectDetection):
 	__gestures = (
@@ -139,30 +222,13 @@ class EnhancedEditableText(EditableTextWithoutAutoSelectDetection):
 				"kb:alt+upArrow",
 				"kb:control+[",
 				"kb:control+]",
-				"kb:f2",
-				"kb:shift+f2",
-				"kb:control+b",
-				"kb:control+alt+leftArrow",
-				"kb:control+alt+rightArrow",
 				"kb:control+y",
-				"kb:f3",
-				"kb:shift+f3",
-				"kb:control+u",
-				"kb:control+shift+backspace",
 				"kb:control+/",
-				"kb:alt+j",
-				"kb:alt+control+downArrow",
-				"kb:alt+control+upArrow",
 				"kb:control+z",
-				"kb:f8",
-				"kb:alt+shift+f8",
-				"kb:f7",
-				"kb:alt+shift+f7",
-				"kb:shift+f7",
-				"kb:shift+f8",
-				"kb:alt+f10",
 			)
 		} |
+		# these IntelliJ commands can jump far or to another file, so also announce where the caret ended up
+		{ g: "caret_navigate" for g in NAVIGATION_GESTURES } |
 		# these gestures trigger selection change
 		{
 			g: "caret_changeSelection"
@@ -181,34 +247,48 @@ class EnhancedEditableText(EditableTextWithoutAutoSelectDetection):
 	def event_caretMovementFailed(self, gesture):
 		PlaySound('SystemExclamation', SND_ASYNC | SND_ALIAS)
 
+	def script_caret_navigate(self, gesture):
+		self.appModule.startNavigation()
+		self.script_caret_moveByLine(gesture)
+
 	def event_caret(self):
 		super().event_caret()
-		if vars.beepOnBreakpoint:
-			# delay checkForBreakpoint to insure that the line number in the status bar is updated
-			callLater(100, self.checkForBreakpoint)
-
-	def checkForBreakpoint(self):
-		foregroundObj = api.getForegroundObject()
-		appModule = foregroundObj.appModule
-		if appModule.hasBreakpointOnCurrentLine():
-			tones.beep(300, 150)
+		appModule = self.appModule
+		# the new position is read and checked for a breakpoint once the caret events settle
+		if appModule.isNavigating():
+			appModule.navigationCaretMoved()
+		else:
+			appModule.schedulePositionRefresh()
 
 
 class AppModule(appModuleHandler.AppModule):
 	def __init__(self, pid, appName=None):
 		super(AppModule, self).__init__(pid, appName)
 		gui.settingsDialogs.NVDASettingsDialog.categoryClasses.append(IntelliJAddonSettings)
+		registerConfigHandlers()
+		inputCore.decide_executeGesture.register(self.decideExecuteGesture)
 		self.status = None
 		self.lineNumber = None
 		self.bookmarks = None
 		self.lastCheckedBreakpointFile = None
 		self.lastCheckedBreakpointLine = None
+		# caret position read once the caret last settled, used as the start of the next jump
+		self.lastPosition = None
+		self.positionRefresh = None
+		self.navigationStart = None
+		self.navigationTimeout = None
+		self.navigationSettle = None
 		self.watcher = StatusBarWatcher(self)
 		self.watcher.start()
 		self.lastFocus = None
 
 	def terminate(self):
 		self.watcher.stopped = True
+		unregisterConfigHandlers()
+		inputCore.decide_executeGesture.unregister(self.decideExecuteGesture)
+		self.endNavigation()
+		if self.positionRefresh is not None:
+			self.positionRefresh.Stop()
 		gui.settingsDialogs.NVDASettingsDialog.categoryClasses.remove(IntelliJAddonSettings)
 
 	def chooseNVDAObjectOverlayClasses(self, obj, clsList):
@@ -297,7 +377,7 @@ class AppModule(appModuleHandler.AppModule):
 	def script_toggleSpeakOnStatusChanged(self, gesture):
 		newVal = not vars.speakOnChange
 		config.conf[CONF_KEY][SPEAK_ON_STATUS_CHANGED_KEY] = newVal
-		vars.speakOnChange = newVal
+		setGlobalVars()
 		if newVal:
 			ui.message("Enabled automatically reading status bar changes")
 		else:
@@ -307,7 +387,7 @@ class AppModule(appModuleHandler.AppModule):
 	def script_toggleInterruptSpeech(self, gesture):
 		newVal = not vars.interruptSpeech
 		config.conf[CONF_KEY][INTERRUPT_SPEECH_KEY] = newVal
-		vars.interruptSpeech = newVal
+		setGlobalVars()
 		if newVal:
 			ui.message("Enabled interrupting speech while automatically reading status bar changes")
 		else:
@@ -317,9 +397,48 @@ class AppModule(appModuleHandler.AppModule):
 	def script_toggleBeepOnBreakpoint(self, gesture):
 		newVal = not vars.beepOnBreakpoint
 		config.conf[CONF_KEY][BEEP_ON_BREAKPOINT_KEY] = newVal
-		vars.beepOnBreakpoint = newVal
+		setGlobalVars()
 		ui.message("Enabled beep on breakpoint" if newVal else "Disabled beep on breakpoint")
 
+	@script(
+		"Read previous status bar message from history",
+		gesture="kb:nvda+alt+[",
+		category="IntelliJ"
+	)
+	def script_previousStatusMessage(self, gesture):
+		self.reviewStatusHistory(-1)
+
+	@script(
+		"Read next status bar message from history",
+		gesture="kb:nvda+alt+]",
+		category="IntelliJ"
+	)
+	def script_nextStatusMessage(self, gesture):
+		self.reviewStatusHistory(1)
+
+	def reviewStatusHistory(self, offset: int):
+		result = self.watcher.history.step(offset)
+		if result is None:
+			ui.message("No status bar messages in history")
+			return
+		entry, position, total = result
+		ui.message(f"{entry.describe()}, {position} of {total}")
+
+	@script(
+		"Show status bar message history",
+		gesture="kb:nvda+shift+i",
+		category="IntelliJ"
+	)
+	def script_showStatusHistory(self, gesture):
+		entries = self.watcher.history.entries()
+		if not entries:
+			ui.message("No status bar messages in history")
+			return
+		# newest first, as that is usually what is being looked for
+		ui.browseableMessage(
+			"\n".join(entry.describe() for entry in reversed(entries)),
+			title="IntelliJ status bar history")
+
 	@script(
 		"Read current line number from IntelliJ",
 		gesture="kb:nvda+alt+l",
@@ -378,20 +497,23 @@ class AppModule(appModuleHandler.AppModule):
 
 		return None
 
-	def hasBreakpointOnCurrentLine(self):
+	def getCaretPosition(self) -> Optional[CaretPosition]:
 		lineObj = self.getLineNumber()
 		if not lineObj or not lineObj.name or ":" not in lineObj.name:
-			return False
+			return None
 
+		# Example: '12:5' or '12:5 (20 chars)' => line 12, column 5
+		line, _, column = lineObj.name.split(" ")[0].partition(":")
 		try:
-			line = int(lineObj.name.split(":")[0])
+			line = int(line)
 		except ValueError:
-			return False
+			return None
+		column = int(column) if column.isdigit() else None
 
 		# Get file name from window title
 		fg = api.getForegroundObject()
 		if not fg or not fg.windowText:
-			return False
+			return None
 
 		# Example: 'sample – Main.java' => Main.java
 		windowTitle = fg.windowText
@@ -400,6 +522,93 @@ class AppModule(appModuleHandler.AppModule):
 		else:
 			fileName = windowTitle.strip()
 
+		return CaretPosition(fileName, line, column)
+
+	def isNavigating(self) -> bool:
+		return self.navigationTimeout is not None or self.navigationSettle is not None
+
+	def schedulePositionRefresh(self):
+		# coalesces the caret events of ordinary movement into one read once the caret settles
+		if self.positionRefresh is None:
+			self.positionRefresh = callLater(STATUS_BAR_UPDATE_DELAY, self.refreshPosition)
+		else:
+			self.positionRefresh.Restart(STATUS_BAR_UPDATE_DELAY)
+
+	def refreshPosition(self):
+		self.positionRefresh = None
+		self.lastPosition = self.getCaretPosition()
+		if vars.beepOnBreakpoint and self.lastPosition and self.hasBreakpointOnCurrentLine(self.lastPosition):
+			tones.beep(300, 150)
+
+	def decideExecuteGesture(self, gesture) -> bool:
+		# any other input means a jump that didn't move the caret is over,
+		# so the caret events that input causes aren't mistaken for the end of the jump
+		if self.isNavigating() and not getattr(gesture, "isModifier", False) and not isNavigationGesture(gesture):
+			self.cancelNavigation()
+		return True
+
+	def startNavigation(self):
+		if self.isNavigating():
+			# the key is repeating, so report once relative to where the first jump started
+			return
+		if self.positionRefresh is not None:
+			# the caret moved too recently for its position to have been read yet
+			self.positionRefresh.Stop()
+			self.positionRefresh = None
+			self.lastPosition = self.getCaretPosition()
+		self.navigationStart = self.lastPosition
+		self.navigationTimeout = callLater(NAVIGATION_TIMEOUT, self.cancelNavigation)
+
+	def navigationCaretMoved(self):
+		if self.navigationTimeout is not None:
+			self.navigationTimeout.Stop()
+			self.navigationTimeout = None
+		# IntelliJ can fire several caret events for one jump, so only read the new position once they settle
+		if self.navigationSettle is None:
+			self.navigationSettle = callLater(STATUS_BAR_UPDATE_DELAY, self.finishNavigation)
+		else:
+			self.navigationSettle.Restart(STATUS_BAR_UPDATE_DELAY)
+
+	def endNavigation(self) -> Optional[CaretPosition]:
+		for timer in (self.navigationTimeout, self.navigationSettle):
+			if timer is not None:
+				timer.Stop()
+		self.navigationTimeout = None
+		self.navigationSettle = None
+		start = self.navigationStart
+		self.navigationStart = None
+		return start
+
+	def cancelNavigation(self):
+		caretMoved = self.navigationSettle is not None
+		start = self.endNavigation()
+		if caretMoved:
+			self.schedulePositionRefresh()
+		else:
+			# the caret never moved, so it is still where the jump started
+			self.lastPosition = start
+
+	def finishNavigation(self):
+		start = self.endNavigation()
+		end = self.getCaretPosition()
+		self.lastPosition = end
+		if end is None:
+			return
+
+		msg = describeNavigation(start, end)
+		if msg:
+			ui.message(msg)
+		if vars.beepOnBreakpoint and self.hasBreakpointOnCurrentLine(end):
+			tones.beep(300, 150)
+
+	def hasBreakpointOnCurrentLine(self, position: Optional[CaretPosition] = None):
+		if position is None:
+			position = self.getCaretPosition()
+		if position is None:
+			return False
+		fileName = position.file
+		line = position.line
+
 		# optimisation to return early if we got an event for the same line number and file we just checked
 		if self.lastCheckedBreakpointFile == fileName and self.lastCheckedBreakpointLine == line:
 			return False  # Already checked
@@ -492,9 +701,24 @@ class AppModule(appModuleHandler.AppModule):
 		except Exception:
 			log.exception("Error while processing focusGained event")
 		self.lastFocus = obj
+		# focus may have moved to another editor, so the position from the last jump may no longer apply
+		if not self.isNavigating():
+			self.schedulePositionRefresh()
 		nextHandler()
 
 
+def describeNavigation(start: Optional[CaretPosition], end: CaretPosition) -> Optional[str]:
+	"""Describes only what changed between two caret positions, since the new line itself is read separately."""
+	if start is None or start.file != end.file:
+		return f"{end.file}, line {end.line}"
+	distance = end.line - start.line
+	if distance == 0:
+		if start.column is None or end.column is None or start.column == end.column:
+			return None
+		return f"column {end.column}"
+	lines = "line" if abs(distance) == 1 else "lines"
+	return f"{abs(distance)} {lines} {'down' if distance > 0 else 'up'}"
+
 def isVisibleOnScreen(obj) -> bool:
 	states = obj.states
 	return not (INVISIBLE in states or OFFSCREEN in states)
@@ -516,6 +740,70 @@ def clickMouse() -> None:
 	mouseHandler.executeMouseEvent(winUser.MOUSEEVENTF_LEFTDOWN,0,0)
 	mouseHandler.executeMouseEvent(winUser.MOUSEEVENTF_LEFTUP,0,0)
 
+@dataclass
+class StatusHistoryEntry:
+	text: str
+	firstSeen: float
+	lastSeen: float
+	count: int = 1
+
+	def describe(self) -> str:
+		if self.count > 1:
+			return f"{self.text}, repeated {self.count} times, first at {formatTime(self.firstSeen)}, last at {formatTime(self.lastSeen)}"
+		return f"{self.text}, at {formatTime(self.lastSeen)}"
+
+def formatTime(timestamp: float) -> str:
+	return time.strftime('%H:%M:%S', time.localtime(timestamp))
+
+class StatusHistory:
+	"""Fixed-size ring buffer of recent status bar messages.
+	Written to by the watcher thread and read by scripts, so all access goes through a lock.
+	"""
+
+	def __init__(self, size: int):
+		self._lock = threading.Lock()
+		self._entries = deque(maxlen=size)
+		# index into _entries of the entry last reviewed, None when not reviewing
+		self._position = None
+
+	def resize(self, size: int) -> None:
+		with self._lock:
+			if self._entries.maxlen != size:
+				# keeps the newest messages when shrinking
+				self._entries = deque(self._entries, maxlen=size)
+				self._position = None
+
+	def add(self, text: str, now: float) -> None:
+		with self._lock:
+			# repeated messages share the same string and only bump the count of the latest entry
+			text = sys.intern(text)
+			if self._entries and self._entries[-1].text == text:
+				latest = self._entries[-1]
+				latest.lastSeen = now
+				latest.count += 1
+			else:
+				self._entries.append(StatusHistoryEntry(text, now, now))
+			self._position = None
+
+	def step(self, offset: int):
+		"""Moves the review position by offset, where negative is towards older messages.
+		Returns the entry, its 1-based position and the history length, or None if the history is empty.
+		Stops at either end of the history.
+		"""
+		with self._lock:
+			if not self._entries:
+				return None
+			last = len(self._entries) - 1
+			# when not reviewing, start from just past the newest message
+			start = last + 1 if self._position is None else self._position
+			position = min(max(start + offset, 0), last)
+			self._position = position
+			return self._entries[position], position + 1, len(self._entries)
+
+	def entries(self) -> list:
+		with self._lock:
+			return list(self._entries)
+
 class StatusBarWatcher(threading.Thread):
 	STATUS_CHANGED_TONE = 1000
 	AFTER_TONE = 800
@@ -527,6 +815,8 @@ class StatusBarWatcher(threading.Thread):
 		super(StatusBarWatcher, self).__init__()
 		self.stopped = False
 		self._lastText = ""
+		self._settings = vars
+		self.history = StatusHistory(vars.statusHistorySize)
 		self.addon = addon
 		self.lastRefresh = time.time()
 
@@ -538,23 +828,32 @@ class StatusBarWatcher(threading.Thread):
 		msg = obj.firstChild.name
 
 		if self._lastText != msg:
-			if msg and vars.beepOnChange:
+			# read settings once, so a profile switch mid update can't mix old and new values
+			settings = vars
+			if msg and settings.beepOnChange:
 				tones.beep(StatusBarWatcher.STATUS_CHANGED_TONE, 50)
-			elif not msg and vars.beepOnClear:
+			elif not msg and settings.beepOnClear:
 				tones.beep(StatusBarWatcher.STATUS_CLEARED_TONE, 50)
 
-			if msg and vars.speakOnChange:
+			if msg and settings.speakOnChange:
 				seq = []
-				if vars.beepBeforeReading:
+				if settings.beepBeforeReading:
 					seq.append(speech.commands.BeepCommand(StatusBarWatcher.STATUS_CHANGED_TONE, 50))
 				seq.append(msg)
-				if vars.beepAfterReading:
+				if settings.beepAfterReading:
 					seq.append(speech.commands.BeepCommand(StatusBarWatcher.AFTER_TONE, 50))
-				speech.speak(seq, priority= speech.Spri.NOW if vars.interruptSpeech else speech.Spri.NORMAL)
+				speech.speak(seq, priority= speech.Spri.NOW if settings.interruptSpeech else speech.Spri.NORMAL)
 
+			if msg:
+				self.history.add(msg, time.time())
 			self._lastText = msg
 
 	def _runLoopIteration(self):
+		# setGlobalVars swaps in a new snapshot whenever the settings may have changed,
+		# so apply a new history size straight away rather than on the next status message
+		if vars is not self._settings:
+			self._settings = vars
+			self.history.resize(vars.statusHistorySize)
 		now = time.time()
 		shouldRefresh = now - self.lastRefresh > StatusBarWatcher .REFRESH_INTERVAL
 		if shouldRefresh:
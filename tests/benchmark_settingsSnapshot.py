@@ -0,0 +1,35 @@
+# Compares reading a setting from the Vars snapshot with looking it up through config.conf.
+# Run from the repository root with: python tests/benchmark_settingsSnapshot.py
+# config.conf is the stub from conftest.py, which only models the cached lookup path of NVDA's
+# config.AggregatedSection, so the real config.conf lookup is at least as slow as measured here.
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(__file__))
+import conftest  # noqa: F401, installs the NVDA module stubs
+import config
+import idea64
+
+NUMBER = 100000
+REPEAT = 5
+
+
+def bestOf(stmt, globals):
+	return min(timeit.repeat(stmt, globals=globals, number=NUMBER, repeat=REPEAT))
+
+
+def main():
+	direct = bestOf(
+		"conf[CONF_KEY][BEEP_ON_STATUS_CHANGED_KEY]",
+		{"conf": config.conf, "CONF_KEY": idea64.CONF_KEY, "BEEP_ON_STATUS_CHANGED_KEY": idea64.BEEP_ON_STATUS_CHANGED_KEY},
+	)
+	snapshot = bestOf("vars.beepOnChange", idea64.__dict__)
+	print(f"config.conf lookup: {direct:.4f}s per {NUMBER} reads")
+	print(f"Vars snapshot:      {snapshot:.4f}s per {NUMBER} reads")
+	print(f"snapshot is {direct / snapshot:.1f}x faster")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,166 @@
+# Stubs for the NVDA modules imported by the app module, so its pure logic can be tested outside of NVDA.
+
+import os
+import sys
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class ExtensionPoint:
+	def __init__(self):
+		self.handlers = []
+
+	def register(self, handler):
+		if handler not in self.handlers:
+			self.handlers.append(handler)
+
+	def unregister(self, handler):
+		if handler in self.handlers:
+			self.handlers.remove(handler)
+
+	def notify(self, **kwargs):
+		for handler in self.handlers:
+			handler()
+
+
+class AggregatedSection:
+	"""Mirrors the cached lookup path of NVDA's config.AggregatedSection:
+	a value is looked up through the active profiles once and cached until the next profile switch.
+	"""
+
+	def __init__(self, manager, path):
+		self.manager = manager
+		self.path = path
+		self._cache = {}
+
+	def __getitem__(self, key):
+		try:
+			val = self._cache[key]
+		except KeyError:
+			pass
+		else:
+			if val is KeyError:
+				raise KeyError(key)
+			return val
+
+		path = self.path + (key,)
+		for profile in reversed(self.manager.profiles):
+			section = profile
+			try:
+				for part in path:
+					section = section[part]
+			except KeyError:
+				continue
+			break
+		else:
+			section = self.manager.defaults(path)
+		if isinstance(section, dict):
+			section = AggregatedSection(self.manager, path)
+		self._cache[key] = section
+		return section
+
+	def __setitem__(self, key, val):
+		profile = self.manager.profiles[-1]
+		for part in self.path:
+			profile = profile.setdefault(part, {})
+		profile[key] = val
+		self._cache[key] = val
+
+	def get(self, key, default=None):
+		try:
+			return self[key]
+		except KeyError:
+			return default
+
+
+class ConfigManager:
+	def __init__(self):
+		self.spec = {}
+		self.profiles = [{}]
+		self.root = AggregatedSection(self, ())
+
+	def defaults(self, path):
+		section = self.spec
+		for part in path:
+			section = section[part]
+		if isinstance(section, dict):
+			return {}
+		# spec values look like 'boolean(default=True)' or 'integer(default=50, min=1, max=1000)'
+		kind, _, args = section.partition("(default=")
+		default = args.split(",")[0].rstrip(")")
+		if kind == "boolean":
+			return default == "True"
+		return int(default)
+
+	def __getitem__(self, key):
+		return self.root[key]
+
+	def __setitem__(self, key, val):
+		self.profiles[0].setdefault(key, {}).update(val)
+		self.root._cache.clear()
+
+	def get(self, key, default=None):
+		return self.root.get(key, default)
+
+	def switchProfile(self, profile):
+		"""Activates profile on top of the base configuration, like a triggered NVDA profile."""
+		self.profiles = [self.profiles[0], profile]
+		self.root = AggregatedSection(self, ())
+		config.post_configProfileSwitch.notify()
+
+
+def stubModule(name, **attrs):
+	module = types.ModuleType(name)
+	module.__dict__.update(attrs)
+	sys.modules[name] = module
+	return module
+
+
+class Stub:
+	pass
+
+
+config = stubModule(
+	"config",
+	conf=ConfigManager(),
+	post_configProfileSwitch=ExtensionPoint(),
+	post_configReset=ExtensionPoint(),
+)
+stubModule("buildVersion", version_year=2026)
+
+
+def normalizeGestureIdentifier(identifier):
+	# like NVDA, lower case and put modifiers in a fixed order
+	source, _, keys = identifier.lower().partition(":")
+	*modifiers, key = keys.split("+")
+	return f"{source}:{'+'.join(sorted(modifiers) + [key])}"
+
+
+stubModule("inputCore", normalizeGestureIdentifier=normalizeGestureIdentifier, decide_executeGesture=ExtensionPoint())
+stubModule("appModuleHandler", AppModule=Stub)
+class EditableTextStub:
+	def event_caret(self):
+		pass
+
+
+stubModule("editableText", EditableTextWithoutAutoSelectDetection=EditableTextStub)
+settingsDialogs = stubModule("gui.settingsDialogs", SettingsPanel=Stub, NVDASettingsDialog=MagicMock())
+stubModule("gui", settingsDialogs=settingsDialogs, guiHelper=MagicMock(), nvdaControls=MagicMock())
+stubModule("scriptHandler", script=lambda *args, **kwargs: (lambda func: func))
+stubModule("winsound", PlaySound=MagicMock(), SND_ASYNC=1, SND_ALIAS=0x10000)
+stubModule("core", callLater=MagicMock())
+for name in ("tones", "controlTypes", "logHandler", "speech", "ui", "api", "wx", "mouseHandler", "winUser"):
+	sys.modules[name] = MagicMock()
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "addon", "appModules"))
+
+
+@pytest.fixture
+def configHandlers():
+	"""Registers the app module's config handlers like a running IntelliJ app module does."""
+	import idea64
+	idea64.registerConfigHandlers()
+	yield
+	idea64.unregisterConfigHandlers()
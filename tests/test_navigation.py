@@ -0,0 +1,157 @@
+import pytest
+
+from conftest import normalizeGestureIdentifier
+import idea64
+from idea64 import AppModule, CaretPosition, EnhancedEditableText, describeNavigation
+
+
+class FakeTimer:
+	def __init__(self, delay, callback):
+		self.delay = delay
+		self.callback = callback
+		self.running = True
+
+	def Stop(self):
+		self.running = False
+
+	def Restart(self, delay):
+		self.delay = delay
+		self.running = True
+
+	def fire(self):
+		assert self.running
+		self.running = False
+		self.callback()
+
+
+@pytest.fixture
+def appModule(monkeypatch):
+	monkeypatch.setattr(idea64, "callLater", FakeTimer)
+	messages = []
+	monkeypatch.setattr(idea64.ui, "message", messages.append)
+	# skip __init__, which starts the status bar watcher thread
+	appModule = AppModule.__new__(AppModule)
+	appModule.lastPosition = None
+	appModule.navigationStart = None
+	appModule.navigationTimeout = None
+	appModule.navigationSettle = None
+	appModule.positionRefresh = None
+	appModule.reads = 0
+	appModule.position = CaretPosition("Main.java", 10, 1)
+	appModule.messages = messages
+
+	def getCaretPosition():
+		appModule.reads += 1
+		return appModule.position
+
+	appModule.getCaretPosition = getCaretPosition
+	return appModule
+
+
+def caretEvent(appModule):
+	obj = EnhancedEditableText()
+	obj.appModule = appModule
+	obj.event_caret()
+
+
+class FakeGesture:
+	isModifier = False
+
+	def __init__(self, identifier):
+		self.normalizedIdentifiers = [normalizeGestureIdentifier(identifier)]
+
+
+def test_describe_other_file():
+	assert describeNavigation(CaretPosition("Main.java", 10, 1), CaretPosition("Util.java", 3, 5)) == "Util.java, line 3"
+	assert describeNavigation(None, CaretPosition("Util.java", 3, 5)) == "Util.java, line 3"
+
+
+def test_describe_jump_distance():
+	assert describeNavigation(CaretPosition("Main.java", 10, 1), CaretPosition("Main.java", 22, 1)) == "12 lines down"
+	assert describeNavigation(CaretPosition("Main.java", 10, 1), CaretPosition("Main.java", 9, 4)) == "1 line up"
+
+
+def test_describe_same_line():
+	assert describeNavigation(CaretPosition("Main.java", 10, 1), CaretPosition("Main.java", 10, 17)) == "column 17"
+	assert describeNavigation(CaretPosition("Main.java", 10, 1), CaretPosition("Main.java", 10, 1)) is None
+	assert describeNavigation(CaretPosition("Main.java", 10, None), CaretPosition("Main.java", 10, 17)) is None
+
+
+def test_position_is_read_after_caret_events_settle(appModule):
+	appModule.startNavigation()
+	# the timer that announces the jump only starts once the caret has moved
+	assert appModule.navigationSettle is None
+	appModule.position = CaretPosition("Util.java", 3, 5)
+	appModule.navigationCaretMoved()
+	appModule.navigationCaretMoved()
+	settle = appModule.navigationSettle
+	settle.fire()
+	assert appModule.messages == ["Util.java, line 3"]
+	assert not appModule.isNavigating()
+
+
+def test_last_position_is_reused_for_next_jump(appModule):
+	caretEvent(appModule)
+	appModule.positionRefresh.fire()
+	appModule.startNavigation()
+	appModule.position = CaretPosition("Main.java", 30, 1)
+	appModule.navigationCaretMoved()
+	appModule.navigationSettle.fire()
+	reads = appModule.reads
+	appModule.startNavigation()
+	assert appModule.reads == reads
+	appModule.position = CaretPosition("Main.java", 25, 1)
+	appModule.navigationCaretMoved()
+	appModule.navigationSettle.fire()
+	assert appModule.messages == ["20 lines down", "5 lines up"]
+
+
+def test_navigation_times_out_without_caret_event(appModule):
+	caretEvent(appModule)
+	appModule.positionRefresh.fire()
+	appModule.startNavigation()
+	appModule.navigationTimeout.fire()
+	assert not appModule.isNavigating()
+	assert appModule.messages == []
+	assert appModule.lastPosition == CaretPosition("Main.java", 10, 1)
+
+
+def test_other_input_ends_jump_that_did_not_move(appModule):
+	appModule.startNavigation()
+	assert appModule.decideExecuteGesture(FakeGesture("kb:downArrow"))
+	assert not appModule.isNavigating()
+	# the caret events caused by the down arrow are ordinary movement
+	appModule.position = CaretPosition("Main.java", 11, 1)
+	caretEvent(appModule)
+	appModule.positionRefresh.fire()
+	assert appModule.messages == []
+	assert appModule.lastPosition == CaretPosition("Main.java", 11, 1)
+
+
+def test_repeated_navigation_key_keeps_jump(appModule):
+	appModule.startNavigation()
+	assert appModule.decideExecuteGesture(FakeGesture("kb:shift+F2"))
+	assert appModule.decideExecuteGesture(FakeGesture("kb:alt+control+downArrow"))
+	assert appModule.isNavigating()
+
+
+def test_no_read_on_keystroke_once_caret_has_settled(appModule):
+	appModule.schedulePositionRefresh()
+	appModule.schedulePositionRefresh()
+	appModule.positionRefresh.fire()
+	assert appModule.reads == 1
+	appModule.startNavigation()
+	assert appModule.reads == 1
+	appModule.position = CaretPosition("Main.java", 40, 1)
+	appModule.navigationCaretMoved()
+	appModule.navigationSettle.fire()
+	assert appModule.reads == 2
+	assert appModule.messages == ["30 lines down"]
+
+
+def test_unsettled_position_is_read_before_jump(appModule):
+	appModule.schedulePositionRefresh()
+	appModule.startNavigation()
+	assert appModule.reads == 1
+	assert appModule.positionRefresh is None
+	assert appModule.navigationStart == CaretPosition("Main.java", 10, 1)
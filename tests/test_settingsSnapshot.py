@@ -0,0 +1,52 @@
+import config
+import pytest
+
+import idea64
+
+
+@pytest.fixture(autouse=True)
+def baseProfile():
+	yield
+	config.conf.profiles[0].pop(idea64.CONF_KEY, None)
+	config.conf.switchProfile({})
+	idea64.setGlobalVars()
+
+
+def test_profile_switch_updates_snapshot(configHandlers):
+	assert idea64.vars.speakOnChange
+	config.conf.switchProfile({idea64.CONF_KEY: {idea64.SPEAK_ON_STATUS_CHANGED_KEY: False}})
+	assert not idea64.vars.speakOnChange
+	config.conf.switchProfile({})
+	assert idea64.vars.speakOnChange
+
+
+def test_config_reset_updates_snapshot(configHandlers):
+	config.conf[idea64.CONF_KEY] = {idea64.STATUS_HISTORY_SIZE_KEY: 7}
+	config.post_configReset.notify(factoryDefaults=False)
+	assert idea64.vars.statusHistorySize == 7
+
+
+def test_snapshot_is_immutable():
+	with pytest.raises(AttributeError):
+		idea64.vars.beepOnChange = True
+
+
+def test_snapshot_matches_config():
+	conf = config.conf[idea64.CONF_KEY]
+	assert idea64.vars.beepOnChange == conf[idea64.BEEP_ON_STATUS_CHANGED_KEY]
+	assert idea64.vars.statusHistorySize == conf[idea64.STATUS_HISTORY_SIZE_KEY]
+
+
+def test_handlers_stay_registered_until_last_app_module_terminates():
+	idea64.registerConfigHandlers()
+	idea64.registerConfigHandlers()
+	idea64.unregisterConfigHandlers()
+	config.conf.switchProfile({idea64.CONF_KEY: {idea64.SPEAK_ON_STATUS_CHANGED_KEY: False}})
+	assert not idea64.vars.speakOnChange
+	idea64.unregisterConfigHandlers()
+	config.conf.switchProfile({})
+	assert not idea64.vars.speakOnChange
+	# the first app module to start again picks up the switch it missed
+	idea64.registerConfigHandlers()
+	assert idea64.vars.speakOnChange
+	idea64.unregisterConfigHandlers()
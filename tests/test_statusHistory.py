@@ -0,0 +1,112 @@
+import tracemalloc
+
+import config
+
+import idea64
+from idea64 import StatusBarWatcher, StatusHistory
+
+
+def message(*parts):
+	# build strings at runtime, so equal messages start out as distinct objects like those read from the status bar
+	return " ".join(str(part) for part in parts)
+
+
+def test_length_stays_bounded():
+	history = StatusHistory(5)
+	for i in range(20):
+		history.add(message("error", i), float(i))
+	entries = history.entries()
+	assert len(entries) == 5
+	assert [entry.text for entry in entries] == [message("error", i) for i in range(15, 20)]
+
+
+def test_repeated_messages_share_one_string():
+	history = StatusHistory(10)
+	for i in range(9):
+		history.add(message("warning", i % 3), float(i))
+	entries = history.entries()
+	assert len(entries) == 9
+	for entry in entries:
+		assert entry.text is entries[int(entry.text.split()[-1])].text
+
+
+def test_consecutive_repeats_bump_count():
+	history = StatusHistory(10)
+	for i in range(3):
+		history.add(message("unused", "import"), float(i))
+	history.add(message("missing", "semicolon"), 3.0)
+	first, second = history.entries()
+	assert first.count == 3
+	assert first.firstSeen == 0.0
+	assert first.lastSeen == 2.0
+	assert second.count == 1
+	assert "repeated 3 times" in first.describe()
+
+
+def test_resize():
+	history = StatusHistory(10)
+	for i in range(10):
+		history.add(message("error", i), float(i))
+	history.resize(3)
+	assert [entry.text for entry in history.entries()] == [message("error", i) for i in range(7, 10)]
+	history.resize(5)
+	history.add(message("error", 10), 10.0)
+	history.add(message("error", 11), 11.0)
+	assert [entry.text for entry in history.entries()] == [message("error", i) for i in range(7, 12)]
+
+
+def test_watcher_resizes_history_when_settings_change(configHandlers):
+	class Addon:
+		def getStatusBar(self, refresh=False):
+			return None
+
+	watcher = StatusBarWatcher(Addon())
+	for i in range(10):
+		watcher.history.add(message("error", i), float(i))
+	config.conf.switchProfile({idea64.CONF_KEY: {idea64.STATUS_HISTORY_SIZE_KEY: 4}})
+	try:
+		# applied without waiting for another status message
+		watcher._runLoopIteration()
+		assert len(watcher.history.entries()) == 4
+	finally:
+		config.conf.switchProfile({})
+	watcher._runLoopIteration()
+	assert len(watcher.history.entries()) == 4
+	for i in range(10, 20):
+		watcher.history.add(message("error", i), float(i))
+	assert len(watcher.history.entries()) == 14
+
+
+def test_memory_stays_bounded():
+	history = StatusHistory(50)
+
+	def session():
+		for i in range(20000):
+			history.add(message("error", i % 200), float(i))
+
+	tracemalloc.start()
+	try:
+		# the first pass fills the buffer and lets the interpreter's intern table grow to fit
+		session()
+		before = tracemalloc.get_traced_memory()[0]
+		session()
+		after = tracemalloc.get_traced_memory()[0]
+	finally:
+		tracemalloc.stop()
+	# evicted entries and their strings are freed, so a longer session uses no more memory
+	assert after - before < 16 * 1024
+
+
+def test_step_stops_at_either_end():
+	history = StatusHistory(10)
+	assert history.step(-1) is None
+	for i in range(3):
+		history.add(message("error", i), float(i))
+	assert history.step(-1)[1:] == (3, 3)
+	assert history.step(-1)[1:] == (2, 3)
+	assert history.step(-5)[1:] == (1, 3)
+	assert history.step(5)[1:] == (3, 3)
+	# a new message ends reviewing, so the next step starts from the newest message again
+	history.step(-2)
+	history.add(message("error", 3), 3.0)
+	assert history.step(-1)[0].text == message("error", 3)